@@ -1,6 +1,91 @@
+import os
+import sys
 import open3d as o3d
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
+from lod import LODCache, to_world
+
+TRIANGLE_BUDGET = 1_000_000
+LOD_BUDGETS = (100_000, 25_000, 5_000, 1_000, 250)
+#Larger meshes are not simplified while rendering, simplify takes minutes at this size
+MAX_SYNC_TRIANGLES = 200_000
+
+#Shared between calls, so every frame after the first reuses the simplified meshes
+LOD_CACHE = LODCache(LOD_BUDGETS)
+
+def _lod_mesh(mesh, vertices, triangles, vertex_map):
+    lod_mesh = o3d.geometry.TriangleMesh(o3d.utility.Vector3dVector(vertices), o3d.utility.Vector3iVector(triangles))
+
+    if mesh.has_vertex_colors():
+        lod_mesh.vertex_colors = o3d.utility.Vector3dVector(np.asarray(mesh.vertex_colors)[vertex_map])
+
+    lod_mesh.compute_vertex_normals()
+    return lod_mesh
+
+def apply_lod(meshes, lod_cache = None, triangle_budget = TRIANGLE_BUDGET, primitives = None):
+    """
+    Level of detail stage between the geometry model and rendering.
+    Meshes are only simplified when the scene exceeds triangle_budget, each being given an equal share of it.
+    Meshes that are not simplified keep all their attributes. Simplified meshes keep their vertex colors,
+    but per triangle attributes such as triangle_uvs and textures are dropped.
+
+    meshes : list[o3d.geometry.TriangleMesh]
+        Full resolution meshes of the scene. When primitives are given, meshes are in their primitive's local,
+        pre-transform space, and are placed in world space after the LOD level is picked.
+        Otherwise meshes are already in world space and each is cached under the mesh object itself,
+        so pass the same, unmodified mesh objects every frame.
+
+    lod_cache : None | LODCache = None
+        Cache of simplified meshes, shared between instances of the same primitive type. Defaults to LOD_CACHE.
+        Meshes above MAX_SYNC_TRIANGLES must already be cached when they need simplifying, build their chains
+        ahead of time with lod_cache.get_chain(primitive or mesh, vertices, triangles).
+
+    primitives : None | list[PrimitiveGeomObject] = None
+        Primitive each mesh was built from.
+    """
+    if lod_cache is None:
+        lod_cache = LOD_CACHE
+
+    if primitives is not None and len(primitives) != len(meshes):
+        raise ValueError("primitives must be the same length as meshes")
+
+    total_triangles = sum(len(mesh.triangles) for mesh in meshes)
+    mesh_budget = triangle_budget // max(len(meshes), 1)
+    out_meshes = []
+
+    for i, mesh in enumerate(meshes):
+        primitive = None if primitives is None else primitives[i]
+
+        if total_triangles <= triangle_budget or len(mesh.triangles) <= mesh_budget:
+            if primitive is None:
+                out_meshes.append(mesh)
+                continue
+
+            world_mesh = o3d.geometry.TriangleMesh(mesh)
+            world_mesh.vertices = o3d.utility.Vector3dVector(to_world(primitive, np.asarray(mesh.vertices)))
+
+            if mesh.has_vertex_normals():
+                world_mesh.compute_vertex_normals()
+
+            out_meshes.append(world_mesh)
+            continue
+
+        key = mesh if primitive is None else primitive
+
+        if not lod_cache.has_chain(key) and len(mesh.triangles) > MAX_SYNC_TRIANGLES:
+            raise ValueError(f"Mesh {i} has {len(mesh.triangles)} triangles, more than MAX_SYNC_TRIANGLES ({MAX_SYNC_TRIANGLES}) "
+                             "to simplify while rendering. Build its LOD chain ahead of time with lod_cache.get_chain")
+
+        vertices, triangles, vertex_map = lod_cache.get_level(key, np.asarray(mesh.vertices), np.asarray(mesh.triangles), mesh_budget)
+
+        if primitive is not None:
+            vertices = to_world(primitive, vertices)
+
+        out_meshes.append(_lod_mesh(mesh, vertices, triangles, vertex_map))
+
+    return out_meshes
+
 def main():
     N = 5
     vertices = o3d.utility.Vector3dVector(
@@ -14,7 +99,7 @@ def main():
     mesh_np.compute_vertex_normals()
     print(np.asarray(mesh_np.triangle_normals))
     print("Displaying mesh made using numpy ...")
-    o3d.visualization.draw_geometries([mesh_np])
+    o3d.visualization.draw_geometries(apply_lod([mesh_np]))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
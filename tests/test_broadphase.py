@@ -0,0 +1,99 @@
+import math
+import numpy as np
+import pytest
+from broadphase import *
+
+def rect(x_0, y_0, x_1, y_1):
+    return Polygon(([x_0, y_0], [x_1, y_0], [x_1, y_1], [x_0, y_1]))
+
+def brute_force_pairs(mins, maxs):
+    overlap = np.all((mins[:, None] <= maxs[None]) & (mins[None] <= maxs[:, None]), axis = 2)
+    inds_1, inds_2 = np.nonzero(np.triu(overlap, 1))
+
+    return list(zip(inds_1.tolist(), inds_2.tolist()))
+
+@pytest.mark.parametrize("other, expected", [
+    (rect(0, 0, 1, 1), True),
+    (rect(0.5, 0, 1.5, 1), True),
+    (rect(0.2, 0.2, 0.8, 0.8), True),
+    (rect(-1, -1, 2, 2), True),
+    (rect(0.5, -1, 0.6, 2), True),
+    (Polygon.reverse(rect(0, 0, 1, 1)), True),
+    (rect(1, 0, 2, 1), False),
+    (rect(1, 1, 2, 2), False),
+    (rect(3, 3, 4, 4), False),
+    (Polygon(([1, 0.5], [2, 0], [2, 1])), False),
+])
+def test_polygon_overlaps(other, expected):
+    square = rect(0, 0, 1, 1)
+
+    assert square.overlaps(other) == expected
+    assert other.overlaps(square) == expected
+
+def test_polygon_aabbs():
+    mins, maxs = polygon_aabbs([rect(0, 0, 1, 2), Polygon(([-1, 3], [2, 4], [0, 5]))])
+
+    assert np.allclose(mins, [[0, 0, 0], [-1, 3, 0]])
+    assert np.allclose(maxs, [[1, 2, 0], [2, 5, 0]])
+
+def test_primitive_aabbs():
+    cube = PrimitiveCube(scale = [2, 1, 1], pos = [1, 2, 3], rotor = Quaternion.construct_rotor(Vector3(0, 0, 1), math.pi/2))
+    prism = PrimitivePrism(rect(0, 0, 4, 2), pos = [10, 0, 0])
+    child = PrimitiveCube(pos = [1, 0, 0], parent = prism)
+
+    mins, maxs = compute_aabbs([cube, rect(0, 0, 1, 1), prism, child])
+
+    assert np.allclose(mins, [[0.5, 1, 2.5], [0, 0, 0], [8, -1, -0.5], [10.5, -0.5, -0.5]])
+    assert np.allclose(maxs, [[1.5, 3, 3.5], [1, 1, 0], [12, 1, 0.5], [11.5, 0.5, 0.5]])
+
+def test_sweep_matches_brute_force_through_updates():
+    rng = np.random.default_rng(0)
+    mins = rng.uniform(0, 50, (400, 3))
+    maxs = mins + rng.uniform(0, 4, (400, 3))
+
+    sweep = SweepAndPrune(mins, maxs)
+    assert [tuple(pair) for pair in sweep.pairs().tolist()] == brute_force_pairs(mins, maxs)
+
+    for _ in range(10):
+        inds = rng.choice(400, 5, replace = False)
+        new_mins = rng.uniform(0, 50, (5, 3))
+        new_maxs = new_mins + rng.uniform(0, 8, (5, 3))
+
+        sweep.update(inds, new_mins, new_maxs)
+        mins[inds] = new_mins
+        maxs[inds] = new_maxs
+
+        assert [tuple(pair) for pair in sweep.pairs().tolist()] == brute_force_pairs(mins, maxs)
+
+def test_overlapping_polygons_matches_brute_force():
+    #Integer grid rectangles, so shared edges and corners are common
+    rng = np.random.default_rng(1)
+    corners = rng.integers(0, 20, (150, 2))
+    sizes = rng.integers(1, 4, (150, 2))
+    polygons = [rect(*map(int, corner), *map(int, corner + size)) for corner, size in zip(corners, sizes)]
+
+    expected = []
+    for i in range(len(polygons)):
+        for j in range(i + 1, len(polygons)):
+            if np.all(corners[i] < corners[j] + sizes[j]) and np.all(corners[j] < corners[i] + sizes[i]):
+                expected.append((i, j))
+
+    assert overlapping_polygons(polygons) == expected
+    assert overlapping_polygons(polygons, sweep = SweepAndPrune.from_objects(polygons)) == expected
+
+def test_update_with_nothing_moved():
+    sweep = SweepAndPrune(np.array([[0.0, 0.0], [1.0, 0.0]]), np.array([[2.0, 1.0], [3.0, 1.0]]))
+    pairs = sweep.pairs().copy()
+
+    sweep.update([], np.zeros((0, 2)), np.zeros((0, 2)))
+    assert np.array_equal(sweep.pairs(), pairs)
+
+    empty = SweepAndPrune(np.zeros((0, 2)), np.zeros((0, 2)))
+    empty.update(np.array([], dtype = int), np.zeros((0, 2)), np.zeros((0, 2)))
+    assert len(empty.pairs()) == 0
+
+def test_zero_rotor_raises():
+    cube = PrimitiveCube(rotor = Quaternion(0, 0, 0, 0))
+
+    with pytest.raises(ValueError):
+        primitive_aabbs([cube])
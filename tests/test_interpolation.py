@@ -0,0 +1,72 @@
+import math
+import numpy as np
+import pytest
+from interpolation import *
+
+def test_slerp_matches_scalar():
+    rng = np.random.default_rng(0)
+    rotors_1 = rng.normal(size = (200, 4))
+    rotors_2 = rng.normal(size = (200, 4))
+    t = rng.uniform(size = 200)
+
+    expected = rotors_to_array([Quaternion.slerp(Quaternion(*q_1), Quaternion(*q_2), t_i) for q_1, q_2, t_i in zip(rotors_1.tolist(), rotors_2.tolist(), t.tolist())])
+
+    assert np.allclose(slerp(rotors_1, rotors_2, t), expected)
+
+def test_slerp_halfway_rotation():
+    start = rotors_to_array([Quaternion(0, 0, 0, 1)])
+    end = rotors_to_array([Quaternion.construct_rotor(Vector3(0, 0, 1), math.pi/2)])
+
+    halfway = array_to_rotors(slerp(start, end, 0.5))[0]
+
+    assert halfway == Quaternion.construct_rotor(Vector3(0, 0, 1), math.pi/4)
+
+def test_nlerp_is_normalized_and_takes_shortest_arc():
+    start = np.array([[0, 0, 0, 1.0]])
+    end = np.array([[0, 0, 0, -1.0]])
+
+    out = nlerp(start, end, 0.5)
+
+    assert np.allclose(out, start)
+
+def test_zero_rotor_raises():
+    with pytest.raises(ValueError):
+        slerp(np.zeros((1, 4)), np.array([[0, 0, 0, 1.0]]), 0.5)
+
+    with pytest.raises(ValueError):
+        nlerp(np.array([[0, 0, 0, 1.0]]), np.zeros((1, 4)), 0.5)
+
+    with pytest.raises(ValueError):
+        RotorTrack([0, 1], np.zeros((1, 2, 4)))
+
+def test_track_matches_scalar_slerp():
+    rng = np.random.default_rng(1)
+    times = np.cumsum(rng.uniform(0.1, 1, (50, 4)), axis = 1)
+    keys = rng.normal(size = (50, 4, 4))
+    samples = np.linspace(0, 5, 30)
+
+    out = RotorTrack(times, keys).sample(samples)
+    assert out.shape == (50, 30, 4)
+
+    for obj in range(50):
+        for ind, t in enumerate(samples.tolist()):
+            t = min(max(t, times[obj, 0]), times[obj, -1])
+            seg = min(max(int(np.searchsorted(times[obj], t, side = "right")) - 1, 0), 2)
+            u = (t - times[obj, seg])/(times[obj, seg + 1] - times[obj, seg])
+
+            expected = Quaternion.slerp(Quaternion(*keys[obj, seg].tolist()), Quaternion(*keys[obj, seg + 1].tolist()), u)
+            assert np.allclose(out[obj, ind], [expected.x, expected.y, expected.z, expected.s])
+
+def test_track_from_rotors_with_shared_times():
+    track = RotorTrack.from_rotors([0, 1], [[Quaternion(0, 0, 0, 1), Quaternion.construct_rotor(Vector3(1, 0, 0), math.pi/2)]], mode = "nlerp")
+
+    out = track.sample([-1, 0.5, 2])
+
+    assert np.allclose(out[0, 0], [0, 0, 0, 1])
+    assert np.allclose(out[0, 1], [math.sin(math.pi/8), 0, 0, math.cos(math.pi/8)])
+    assert np.allclose(out[0, 2], [math.sin(math.pi/4), 0, 0, math.cos(math.pi/4)])
+
+def test_empty_track_samples_empty():
+    track = RotorTrack([0, 1], np.zeros((0, 2, 4)))
+
+    assert track.sample([0, 0.5, 1]).shape == (0, 3, 4)
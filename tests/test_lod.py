@@ -0,0 +1,147 @@
+import math
+import numpy as np
+import pytest
+from lod import *
+
+def grid(n, height = 0):
+    xs, ys = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n), indexing = "ij")
+    vertices = np.stack((xs.ravel(), ys.ravel(), height + 0.1 * np.sin(3 * xs.ravel()) * np.cos(2 * ys.ravel())), axis = 1)
+
+    i, j = np.meshgrid(np.arange(n - 1), np.arange(n - 1), indexing = "ij")
+    a = (i * n + j).ravel()
+    triangles = np.concatenate((np.stack((a, a + n, a + 1), axis = 1), np.stack((a + 1, a + n, a + n + 1), axis = 1)))
+
+    return vertices, triangles
+
+def test_simplify_meets_budget():
+    vertices, triangles = grid(30)
+    new_vertices, new_triangles, vertex_map = simplify(vertices, triangles, 200)
+
+    assert len(new_triangles) <= 200
+    assert new_triangles.max() < len(new_vertices)
+    assert np.all(new_triangles[:, 0] != new_triangles[:, 1])
+    #Border constraints keep the simplified mesh on the original footprint
+    assert np.all(new_vertices[:, :2] > -1e-3) and np.all(new_vertices[:, :2] < 1 + 1e-3)
+    #Each kept vertex maps back to a distinct nearby input vertex
+    assert len(np.unique(vertex_map)) == len(new_vertices)
+    assert np.linalg.norm(new_vertices - vertices[vertex_map], axis = 1).max() < 0.3
+
+def test_simplify_batched_matches_greedy_quality():
+    vertices, triangles = grid(30)
+
+    for batch_size in (1, BATCH_SIZE):
+        new_vertices, new_triangles, _ = simplify(vertices, triangles, 300, batch_size = batch_size)
+        expected = 0.1 * np.sin(3 * new_vertices[:, 0]) * np.cos(2 * new_vertices[:, 1])
+        assert np.abs(new_vertices[:, 2] - expected).max() < 0.02
+
+def test_lod_chain_is_progressively_coarser():
+    vertices, triangles = grid(30)
+    chain = build_lod_chain(vertices, triangles, [50, 500, 100])
+
+    assert [len(level[1]) <= budget for level, budget in zip(chain[1:], (500, 100, 50))] == [True] * 3
+    assert len(chain[0][1]) == len(triangles)
+
+    for level_vertices, _, vertex_map in chain:
+        assert vertex_map.max() < len(vertices)
+        assert np.linalg.norm(level_vertices - vertices[vertex_map], axis = 1).max() < 0.5
+
+def test_cache_keeps_distinct_keys_apart():
+    cache = LODCache([100])
+    low = grid(20)
+    high = grid(20, height = 5)
+
+    low_level = cache.get_level("low", *low, 100)
+    high_level = cache.get_level("high", *high, 100)
+
+    assert np.all(low_level[0][:, 2] < 1)
+    assert np.all(high_level[0][:, 2] > 4)
+
+def test_cache_shares_instances_of_a_primitive_type():
+    cache = LODCache([100])
+    vertices, triangles = grid(20)
+
+    cube_1 = PrimitiveCube(pos = Vector3(0, 0, 0))
+    cube_2 = PrimitiveCube(pos = Vector3(10, 0, 0), scale = 2)
+
+    assert cache.get_chain(cube_1, vertices, triangles) is cache.get_chain(cube_2, vertices + 1, triangles)
+
+def test_cache_separates_prisms_by_polygon():
+    square = Polygon(([0, 0], [1, 0], [1, 1], [0, 1]))
+    triangle = Polygon(([0, 0], [1, 0], [0, 1]))
+
+    assert LODCache.key_for(PrimitivePrism(square)) == LODCache.key_for(PrimitivePrism(square, pos = [1, 2, 3]))
+    assert LODCache.key_for(PrimitivePrism(square)) != LODCache.key_for(PrimitivePrism(triangle))
+
+def test_to_world_applies_instance_transform():
+    cube = PrimitiveCube(scale = [2, 1, 1], pos = [1, 2, 3], rotor = Quaternion.construct_rotor(Vector3(0, 0, 1), math.pi/2))
+
+    world = to_world(cube, np.array([[0.5, 0, 0], [0, 0, 0.5]]))
+
+    assert np.allclose(world, [[1, 3, 3], [1, 2, 3.5]])
+
+def make_mesh(o3d, vertices, triangles):
+    mesh = o3d.geometry.TriangleMesh(o3d.utility.Vector3dVector(vertices), o3d.utility.Vector3iVector(triangles))
+    #Color each vertex by its position, so carried colors can be checked against the kept vertex
+    mesh.vertex_colors = o3d.utility.Vector3dVector(np.clip(vertices, 0, 1))
+    return mesh
+
+def test_apply_lod_places_instances_and_keeps_colors():
+    o3d = pytest.importorskip("open3d", exc_type = ImportError)
+    from renderer import apply_lod
+
+    vertices, triangles = grid(20)
+    meshes = [make_mesh(o3d, vertices, triangles) for _ in range(2)]
+    cubes = [PrimitiveCube(pos = [0, 0, 0]), PrimitiveCube(pos = [10, 0, 0])]
+
+    out = apply_lod(meshes, LODCache([100]), triangle_budget = 200, primitives = cubes)
+
+    assert all(len(mesh.triangles) <= 100 for mesh in out)
+    assert np.asarray(out[1].vertices)[:, 0].min() > 9
+    assert all(mesh.has_vertex_colors() and len(mesh.vertex_colors) == len(mesh.vertices) for mesh in out)
+    #Colors follow the kept vertices, which stay close to their original positions
+    assert np.abs(np.asarray(out[0].vertex_colors)[:, :2] - np.asarray(out[0].vertices)[:, :2]).max() < 0.3
+
+def test_apply_lod_under_budget_instance_keeps_attributes():
+    o3d = pytest.importorskip("open3d", exc_type = ImportError)
+    from renderer import apply_lod
+
+    vertices, triangles = grid(5)
+    mesh = make_mesh(o3d, vertices, triangles)
+    mesh.triangle_uvs = o3d.utility.Vector2dVector(np.zeros((3 * len(triangles), 2)))
+
+    out = apply_lod([mesh], LODCache([10]), primitives = [PrimitiveCube(pos = [5, 0, 0])])[0]
+
+    assert np.allclose(np.asarray(out.vertex_colors), np.asarray(mesh.vertex_colors))
+    assert out.has_triangle_uvs()
+    assert np.allclose(np.asarray(out.vertices), vertices + [5, 0, 0])
+    assert np.allclose(np.asarray(mesh.vertices), vertices)
+
+def test_apply_lod_reuses_cache_for_world_meshes():
+    o3d = pytest.importorskip("open3d", exc_type = ImportError)
+    import renderer
+
+    vertices, triangles = grid(20)
+    meshes = [make_mesh(o3d, vertices, triangles), make_mesh(o3d, vertices + 5, triangles)]
+    cache = LODCache([100])
+
+    first = renderer.apply_lod(meshes, cache, triangle_budget = 200)
+    assert all(cache.has_chain(mesh) for mesh in meshes)
+
+    second = renderer.apply_lod(meshes, cache, triangle_budget = 200)
+    assert np.allclose(np.asarray(first[1].vertices), np.asarray(second[1].vertices))
+    assert np.asarray(second[1].vertices).min() > 4
+
+def test_apply_lod_refuses_large_uncached_meshes(monkeypatch):
+    o3d = pytest.importorskip("open3d", exc_type = ImportError)
+    import renderer
+
+    monkeypatch.setattr(renderer, "MAX_SYNC_TRIANGLES", 100)
+    vertices, triangles = grid(20)
+    mesh = make_mesh(o3d, vertices, triangles)
+    cache = LODCache([50])
+
+    with pytest.raises(ValueError):
+        renderer.apply_lod([mesh], cache, triangle_budget = 50)
+
+    cache.get_chain(mesh, vertices, triangles)
+    assert len(renderer.apply_lod([mesh], cache, triangle_budget = 50)[0].triangles) <= 50
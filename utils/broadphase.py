@@ -0,0 +1,241 @@
+import numpy as np
+from polygon import *
+from geom import *
+
+UNIT_BOUNDS = ((-0.5, -0.5, -0.5), (0.5, 0.5, 0.5))
+CORNER_SIGNS = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype = bool)
+
+def polygon_aabbs(polygons):
+    """
+    Computes the axis aligned bounding boxes of a list of Polygons in one vectorized pass.
+    Polygons are treated as lying in the z = 0 plane.
+
+    Returns (mins, maxs), each a (N, 3) array.
+    """
+    if not isinstance(polygons, (list, tuple)):
+        raise ValueError(f"Unsupported polygon list type {type(polygons)}")
+
+    if len(polygons) == 0:
+        return np.zeros((0, 3)), np.zeros((0, 3))
+
+    for poly in polygons:
+        if not isinstance(poly, Polygon):
+            raise ValueError(f"Expected a Polygon, not an object of type {type(poly)}")
+
+    counts = np.array([len(poly.points) for poly in polygons])
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    points = np.array([(point.x, point.y) for poly in polygons for point in poly.points], dtype = float)
+
+    mins = np.zeros((len(polygons), 3))
+    maxs = np.zeros((len(polygons), 3))
+    mins[:, :2] = np.minimum.reduceat(points, starts, axis = 0)
+    maxs[:, :2] = np.maximum.reduceat(points, starts, axis = 0)
+
+    return mins, maxs
+
+def primitive_aabbs(primitives):
+    """
+    Computes the world space axis aligned bounding boxes of a list of PrimitiveGeomObjects in one vectorized pass.
+    Primitives are unit sized before scaling, except PrimitivePrisms which span their polygon in x and y.
+
+    Returns (mins, maxs), each a (N, 3) array.
+    """
+    if not isinstance(primitives, (list, tuple)):
+        raise ValueError(f"Unsupported primitive list type {type(primitives)}")
+
+    if len(primitives) == 0:
+        return np.zeros((0, 3)), np.zeros((0, 3))
+
+    local_lo = np.tile(np.array(UNIT_BOUNDS[0]), (len(primitives), 1))
+    local_hi = np.tile(np.array(UNIT_BOUNDS[1]), (len(primitives), 1))
+    scales = np.empty((len(primitives), 3))
+    positions = np.empty((len(primitives), 3))
+    rotors = np.empty((len(primitives), 4))
+
+    for i, primitive in enumerate(primitives):
+        if not isinstance(primitive, PrimitiveGeomObject):
+            raise ValueError(f"Expected a PrimitiveGeomObject, not an object of type {type(primitive)}")
+
+        if isinstance(primitive, PrimitivePrism):
+            local = np.array([(point.x - primitive.polygon.centroid.x, point.y - primitive.polygon.centroid.y) for point in primitive.polygon.points])
+            local_lo[i, :2] = local.min(axis = 0)
+            local_hi[i, :2] = local.max(axis = 0)
+
+        pos = primitive.get_pos()
+        rotor = primitive.get_orientation()
+
+        scales[i] = (primitive.scale.x, primitive.scale.y, primitive.scale.z)
+        positions[i] = (pos.x, pos.y, pos.z)
+        rotors[i] = (rotor.x, rotor.y, rotor.z, rotor.s)
+
+    #(N, 8, 3) box corners in object space
+    corners = np.where(CORNER_SIGNS[None], local_hi[:, None], local_lo[:, None]) * scales[:, None]
+
+    corners = rotate_points(corners, rotors[:, None]) + positions[:, None]
+
+    return corners.min(axis = 1), corners.max(axis = 1)
+
+def compute_aabbs(objects):
+    """
+    Computes the axis aligned bounding boxes of a mixed list of Polygons and PrimitiveGeomObjects.
+
+    Returns (mins, maxs), each a (N, 3) array in the same order as objects.
+    """
+    if not isinstance(objects, (list, tuple)):
+        raise ValueError(f"Unsupported object list type {type(objects)}")
+
+    poly_inds = [i for i, obj in enumerate(objects) if isinstance(obj, Polygon)]
+    prim_inds = [i for i, obj in enumerate(objects) if not isinstance(obj, Polygon)]
+
+    mins = np.zeros((len(objects), 3))
+    maxs = np.zeros((len(objects), 3))
+
+    mins[poly_inds], maxs[poly_inds] = polygon_aabbs([objects[i] for i in poly_inds])
+    mins[prim_inds], maxs[prim_inds] = primitive_aabbs([objects[i] for i in prim_inds])
+
+    return mins, maxs
+
+class SweepAndPrune:
+    def __init__(self, mins, maxs, axis = None):
+        """
+        Broad phase overlap detection over axis aligned bounding boxes.
+        Boxes are kept sorted by their lower bound along one axis, candidate pairs are then
+        found in O(N log N + K) and filtered against the remaining axes.
+
+        mins : np.ndarray
+            (N, D) array of box lower bounds.
+
+        maxs : np.ndarray
+            (N, D) array of box upper bounds.
+
+        axis : None | int = None
+            Sweep axis. Defaults to the axis along which box centers are most spread out.
+        """
+        self.mins = np.array(mins, dtype = float)
+        self.maxs = np.array(maxs, dtype = float)
+
+        if self.mins.ndim != 2 or self.mins.shape != self.maxs.shape:
+            raise ValueError("mins and maxs must be (N, D) arrays of the same shape")
+
+        if axis is None:
+            axis = int(np.argmax(np.var(self.mins + self.maxs, axis = 0))) if len(self.mins) else 0
+
+        if not isinstance(axis, int) or axis < 0 or axis >= self.mins.shape[1]:
+            raise ValueError(f"axis must be an int between 0 and {self.mins.shape[1] - 1}")
+
+        self.axis = axis
+        self.order = np.argsort(self.mins[:, axis], kind = "stable")
+        self.sorted_mins = self.mins[self.order, axis]
+        #Widest box along the sweep axis, bounds how far back a box can start and still overlap another
+        self.max_extent = float(np.max(self.maxs[:, axis] - self.mins[:, axis])) if len(self.mins) else 0.0
+        self._pairs = None
+
+    @staticmethod
+    def from_objects(objects, axis = None):
+        return SweepAndPrune(*compute_aabbs(objects), axis = axis)
+
+    def _overlap_mask(self, inds_1, inds_2):
+        return np.all((self.mins[inds_1] <= self.maxs[inds_2]) & (self.mins[inds_2] <= self.maxs[inds_1]), axis = 1)
+
+    def pairs(self):
+        """
+        Returns a (K, 2) array of index pairs (i, j), i < j, whose boxes overlap.
+        """
+        if self._pairs is not None:
+            return self._pairs
+
+        sorted_maxs = self.maxs[self.order, self.axis]
+
+        #Every box starting between a box's lower and upper bound overlaps it along the sweep axis
+        ends = np.searchsorted(self.sorted_mins, sorted_maxs, side = "right")
+        counts = np.maximum(ends - np.arange(len(self.sorted_mins)) - 1, 0)
+
+        firsts = np.repeat(np.arange(len(self.sorted_mins)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        seconds = firsts + 1 + offsets
+
+        inds_1 = self.order[firsts]
+        inds_2 = self.order[seconds]
+
+        keep = self._overlap_mask(inds_1, inds_2)
+        pairs = np.stack((inds_1[keep], inds_2[keep]), axis = 1)
+        pairs.sort(axis = 1)
+
+        self._pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        return self._pairs
+
+    def query(self, ind):
+        """
+        Returns the indices of all boxes overlapping box ind, excluding ind itself.
+        Only boxes starting within max_extent before box ind are scanned, so a few very wide boxes make queries approach O(N).
+        """
+        start = np.searchsorted(self.sorted_mins, self.mins[ind, self.axis] - self.max_extent, side = "left")
+        end = np.searchsorted(self.sorted_mins, self.maxs[ind, self.axis], side = "right")
+
+        candidates = self.order[start:end]
+        candidates = candidates[candidates != ind]
+
+        return candidates[self._overlap_mask(candidates, np.full(len(candidates), ind))]
+
+    def update(self, inds, mins, maxs):
+        """
+        Moves the boxes at inds to new bounds.
+        The moved boxes are taken out of the sort order and inserted back at their searchsorted positions,
+        which is O(m log N) searching plus one O(N) array copy per call rather than a re-sort.
+        Cached pairs are only recomputed for the moved boxes, each with a bounded query.
+        """
+        inds = np.atleast_1d(np.asarray(inds, dtype = np.int64))
+
+        #Nothing moved this frame
+        if len(inds) == 0:
+            return
+
+        self.mins[inds] = mins
+        self.maxs[inds] = maxs
+        inds = np.unique(inds)
+
+        moved = np.zeros(len(self.mins), dtype = bool)
+        moved[inds] = True
+
+        staying = ~moved[self.order]
+        order = self.order[staying]
+        sorted_mins = self.sorted_mins[staying]
+
+        new_order = inds[np.argsort(self.mins[inds, self.axis], kind = "stable")]
+        new_mins = self.mins[new_order, self.axis]
+        positions = np.searchsorted(sorted_mins, new_mins, side = "right")
+
+        self.order = np.insert(order, positions, new_order)
+        self.sorted_mins = np.insert(sorted_mins, positions, new_mins)
+        self.max_extent = max(self.max_extent, float(np.max(self.maxs[inds, self.axis] - self.mins[inds, self.axis])))
+
+        if self._pairs is None:
+            return
+
+        pairs = [self._pairs[~(moved[self._pairs[:, 0]] | moved[self._pairs[:, 1]])]]
+
+        for ind in inds.tolist():
+            others = self.query(ind)
+            #Pairs between two moved boxes are only added from the lower index
+            others = others[~moved[others] | (others > ind)]
+            new_pairs = np.stack((np.full(len(others), ind), others), axis = 1)
+            new_pairs.sort(axis = 1)
+            pairs.append(new_pairs)
+
+        pairs = np.concatenate(pairs)
+        self._pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+def overlapping_polygons(polygons, sweep = None):
+    """
+    Finds all pairs of Polygons whose interiors overlap, polygons that only touch are not reported.
+    The exact Polygon.overlaps test is only run on pairs whose bounding boxes overlap.
+
+    sweep : None | SweepAndPrune = None
+        Existing broad phase over the same polygons, built if not given.
+
+    Returns a list of index pairs (i, j), i < j.
+    """
+    if sweep is None:
+        sweep = SweepAndPrune(*polygon_aabbs(polygons))
+
+    return [(i, j) for i, j in sweep.pairs().tolist() if polygons[i].overlaps(polygons[j])]
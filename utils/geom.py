@@ -2,6 +2,31 @@ import numpy as np
 from vector import *
 from polygon import *
 
+def rotate_points(points, rotors):
+    """
+    Rotates points by rotors in one vectorized pass.
+
+    points : np.ndarray
+        (..., 3) array of points.
+
+    rotors : np.ndarray
+        (..., 4) array of rotors in Quaternion component order (x, y, z, s), broadcast against points.
+        Rotors are normalized before use.
+    """
+    points = np.asarray(points, dtype = float)
+    rotors = np.asarray(rotors, dtype = float)
+
+    norms = np.linalg.norm(rotors, axis = -1, keepdims = True)
+    if np.any(norms < EPS):
+        raise ValueError("Rotors cannot have 0 magnitude!")
+
+    rotors = rotors/norms
+    axis = np.broadcast_to(rotors[..., :3], np.broadcast_shapes(points.shape, rotors[..., :3].shape))
+
+    #v' = v + 2s(q x v) + 2q x (q x v)
+    q_cross = np.cross(axis, points)
+    return points + 2 * rotors[..., 3:] * q_cross + 2 * np.cross(axis, q_cross)
+
 class PrimitiveGeomObject:
     FACE_TEMPLATE = {
         "plane" : None,
@@ -43,7 +68,7 @@ class PrimitiveGeomObject:
         """
 
         #Pos type checking and initialization
-        if not isinstance(pos, (Vector3, list[int], list[float])):
+        if not isinstance(pos, (Vector3, list)):
             raise ValueError("pos must be a Vector3 or a length 3 list of numeric types")
         
         if isinstance(pos, list) and len(pos) != 3:
@@ -55,7 +80,7 @@ class PrimitiveGeomObject:
             self.pos = Vector3(*pos)
 
         #Scale type checking and initialization
-        if not isinstance(scale, (int, float, list[int], list[float], Vector3)):
+        if not isinstance(scale, (int, float, list, Vector3)):
             raise ValueError("scale must be numeric, a length 3 list of numeric types, or a Vector3")
         
         if isinstance(scale, (int, float)):
@@ -77,7 +102,7 @@ class PrimitiveGeomObject:
         self.rotor = rotor
 
         #Parent type checking and initialization
-        if not isinstance(parent, (None, GeomObject)):
+        if parent is not None and not isinstance(parent, (PrimitiveGeomObject, GeomObject)):
             raise ValueError("parent must be None or a GeomObject")
         
         self.parent = parent
@@ -100,12 +125,13 @@ class PrimitiveGeomObject:
 
             parent = self
 
-            while parent.parent:
+            while parent:
                 rotor_queue.append(parent.rotor)
+                parent = parent.parent
             
             out_rotor = rotor_queue[-1]
-            for rotor in rotor_queue[:-1]:
-                out_rotor = rotor * out_rotor
+            for rotor in rotor_queue[-2::-1]:
+                out_rotor = out_rotor * rotor
 
             return out_rotor
         
@@ -118,6 +144,7 @@ class PrimitivePrism(PrimitiveGeomObject):
         if not isinstance(polygon, Polygon):
             raise ValueError("polygon must be a Polyon!")
         
+        self.polygon = polygon
         self.verticies = []
         self.edges = []
         self.faces = []
@@ -0,0 +1,173 @@
+import numpy as np
+from vector import *
+
+#Rotor arrays are stored in the same component order as Quaternion, (x, y, z, s)
+
+def rotors_to_array(rotors):
+    if not isinstance(rotors, (list, tuple)):
+        raise ValueError(f"Unsupported rotor list type {type(rotors)}")
+
+    for rotor in rotors:
+        if not isinstance(rotor, Quaternion) or isinstance(rotor, Vector3):
+            raise ValueError(f"Expected a Quaternion, not an object of type {type(rotor)}")
+
+    return np.array([(rotor.x, rotor.y, rotor.z, rotor.s) for rotor in rotors], dtype = float).reshape(-1, 4)
+
+def array_to_rotors(rotors):
+    rotors = np.asarray(rotors, dtype = float)
+
+    if rotors.shape[-1] != 4:
+        raise ValueError(f"Rotor arrays must have a last axis of size 4, not {rotors.shape[-1]}")
+
+    return [Quaternion(*rotor) for rotor in rotors.reshape(-1, 4).tolist()]
+
+def _normalize(rotors):
+    norms = np.linalg.norm(rotors, axis = -1, keepdims = True)
+
+    if np.any(norms < EPS):
+        raise ValueError("Rotors cannot have 0 magnitude!")
+
+    return rotors/norms
+
+def _prepare(rotors_1, rotors_2, t):
+    rotors_1 = np.asarray(rotors_1, dtype = float)
+    rotors_2 = np.asarray(rotors_2, dtype = float)
+    t = np.asarray(t, dtype = float)
+
+    if rotors_1.shape[-1] != 4 or rotors_2.shape[-1] != 4:
+        raise ValueError("Rotor arrays must have a last axis of size 4")
+
+    rotors_1 = _normalize(rotors_1)
+    rotors_2 = _normalize(rotors_2)
+
+    #q and -q are the same rotation, take the shortest arc
+    cos_ang = np.sum(rotors_1 * rotors_2, axis = -1, keepdims = True)
+    rotors_2 = np.where(cos_ang < 0, -rotors_2, rotors_2)
+
+    return rotors_1, rotors_2, np.abs(cos_ang), t[..., None]
+
+def nlerp(rotors_1, rotors_2, t):
+    """
+    Normalized linear interpolation between arrays of rotors.
+
+    rotors_1, rotors_2 : np.ndarray
+        (..., 4) arrays of rotors, broadcast against each other.
+
+    t : float | np.ndarray
+        Interpolation parameter, broadcast against the leading axes of the rotor arrays.
+
+    Returns a (..., 4) array of unit rotors.
+    """
+    rotors_1, rotors_2, _, t = _prepare(rotors_1, rotors_2, t)
+
+    out = rotors_1 * (1 - t) + rotors_2 * t
+    return out/np.linalg.norm(out, axis = -1, keepdims = True)
+
+def slerp(rotors_1, rotors_2, t):
+    """
+    Spherical linear interpolation between arrays of rotors, see nlerp for argument shapes.
+    Nearly parallel pairs fall back to normalized lerp.
+
+    Returns a (..., 4) array of unit rotors.
+    """
+    rotors_1, rotors_2, cos_ang, t = _prepare(rotors_1, rotors_2, t)
+
+    parallel = cos_ang > 1 - 1e-6
+    ang = np.arccos(np.minimum(cos_ang, 1))
+    sin_ang = np.where(parallel, 1, np.sin(ang))
+
+    weight_1 = np.where(parallel, 1 - t, np.sin((1 - t) * ang)/sin_ang)
+    weight_2 = np.where(parallel, t, np.sin(t * ang)/sin_ang)
+
+    out = rotors_1 * weight_1 + rotors_2 * weight_2
+    return out/np.linalg.norm(out, axis = -1, keepdims = True)
+
+class RotorTrack:
+    INTERPOLATORS = {
+        "slerp" : slerp,
+        "nlerp" : nlerp
+    }
+
+    def __init__(self, times, rotors, mode = "slerp"):
+        """
+        Keyframed rotor animation for many objects at once.
+
+        times : np.ndarray
+            (K,) keyframe times shared by every object, or (N, K) keyframe times per object.
+            Must be strictly increasing along the last axis.
+
+        rotors : np.ndarray
+            (N, K, 4) keyframe rotors.
+
+        mode : str = "slerp"
+            Interpolation used between keyframes, "slerp" or "nlerp".
+        """
+        self.rotors = np.asarray(rotors, dtype = float)
+        times = np.asarray(times, dtype = float)
+
+        if self.rotors.ndim != 3 or self.rotors.shape[-1] != 4:
+            raise ValueError("rotors must be a (N, K, 4) array")
+
+        if self.rotors.shape[1] < 1:
+            raise ValueError("A track needs at least 1 keyframe")
+
+        self.rotors = _normalize(self.rotors)
+
+        if times.ndim == 1:
+            times = np.broadcast_to(times, self.rotors.shape[:2])
+
+        if times.shape != self.rotors.shape[:2]:
+            raise ValueError(f"times must be of shape ({self.rotors.shape[1]},) or {self.rotors.shape[:2]}, not {times.shape}")
+
+        if np.any(np.diff(times, axis = 1) <= 0):
+            raise ValueError("Keyframe times must be strictly increasing")
+
+        if mode not in RotorTrack.INTERPOLATORS:
+            raise ValueError(f"mode must be one of {list(RotorTrack.INTERPOLATORS)}, not {mode}")
+
+        self.times = times
+        self.mode = mode
+
+    @staticmethod
+    def from_rotors(times, rotor_lists, mode = "slerp"):
+        """
+        Builds a track from one list of Quaternion keyframes per object.
+        """
+        if not isinstance(rotor_lists, (list, tuple)):
+            raise ValueError(f"Unsupported rotor list type {type(rotor_lists)}")
+
+        return RotorTrack(times, np.stack([rotors_to_array(rotors) for rotors in rotor_lists]), mode = mode)
+
+    def sample(self, t):
+        """
+        Samples every object's rotor at each time in t. Times outside the keyframe range are clamped.
+
+        t : float | np.ndarray
+            (T,) sample times.
+
+        Returns a (N, T, 4) array of unit rotors.
+        """
+        t = np.atleast_1d(np.asarray(t, dtype = float))
+        num_objects, num_keys = self.times.shape
+
+        if num_objects == 0:
+            return np.zeros((0, len(t), 4))
+
+        if num_keys == 1:
+            return np.repeat(self.rotors, len(t), axis = 1)
+
+        #Offset each object's keyframes so a single searchsorted over the flattened times finds every segment
+        start = self.times.min()
+        stride = self.times.max() - start + 1
+        offsets = np.arange(num_objects)[:, None] * stride
+
+        clamped = np.clip(t[None, :], self.times[:, :1], self.times[:, -1:])
+        segments = np.searchsorted((self.times - start + offsets).reshape(-1), (clamped - start + offsets).reshape(-1), side = "right")
+        segments = segments.reshape(num_objects, len(t)) - np.arange(num_objects)[:, None] * num_keys - 1
+        segments = np.clip(segments, 0, num_keys - 2)
+
+        rows = np.arange(num_objects)[:, None]
+        time_1 = self.times[rows, segments]
+        time_2 = self.times[rows, segments + 1]
+
+        return RotorTrack.INTERPOLATORS[self.mode](self.rotors[rows, segments], self.rotors[rows, segments + 1], (clamped - time_1)/(time_2 - time_1))
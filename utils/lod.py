@@ -0,0 +1,389 @@
+import heapq
+import numpy as np
+from geom import *
+
+#Most collapses applied per vectorized round
+BATCH_SIZE = 256
+#Rounds hold at most one collapse per this many remaining faces, keeping coarse levels close to greedy order
+FACES_PER_COLLAPSE = 256
+
+def compute_quadrics(vertices, triangles, boundary_weight = 1e3):
+    """
+    Accumulates the per vertex error quadrics of a triangle mesh in one vectorized pass.
+
+    vertices : np.ndarray
+        (V, 3) array of vertex positions.
+
+    triangles : np.ndarray
+        (F, 3) array of vertex indices.
+
+    boundary_weight : int | float = 1e3
+        Weight of the constraint planes added along open edges so that mesh borders are preserved.
+
+    Returns a (V, 4, 4) array of quadrics.
+    """
+    vertices = np.asarray(vertices, dtype = float)
+    triangles = np.asarray(triangles, dtype = np.int64)
+
+    quadrics = np.zeros((len(vertices), 4, 4))
+
+    if len(triangles) == 0:
+        return quadrics
+
+    p0 = vertices[triangles[:, 0]]
+    p1 = vertices[triangles[:, 1]]
+    p2 = vertices[triangles[:, 2]]
+
+    normals = np.cross(p1 - p0, p2 - p0)
+    areas = np.linalg.norm(normals, axis = 1)
+    valid = areas > 0
+    normals[valid] = normals[valid]/areas[valid, None]
+
+    planes = np.concatenate((normals, -np.einsum("ij,ij->i", normals, p0)[:, None]), axis = 1)
+    face_quadrics = planes[:, :, None] * planes[:, None, :]
+
+    for corner in range(3):
+        np.add.at(quadrics, triangles[:, corner], face_quadrics)
+
+    #Open edges only appear once, constrain them with a plane perpendicular to their face
+    edges = np.concatenate((triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]))
+    edge_faces = np.tile(np.arange(len(triangles)), 3)
+    _, inverse, counts = np.unique(np.sort(edges, axis = 1), axis = 0, return_inverse = True, return_counts = True)
+    boundary = counts[inverse.reshape(-1)] == 1
+
+    if np.any(boundary):
+        b_edges = edges[boundary]
+        b_dirs = vertices[b_edges[:, 1]] - vertices[b_edges[:, 0]]
+        b_normals = np.cross(b_dirs, normals[edge_faces[boundary]])
+        b_norms = np.linalg.norm(b_normals, axis = 1)
+        b_valid = b_norms > 0
+
+        b_edges = b_edges[b_valid]
+        b_normals = b_normals[b_valid]/b_norms[b_valid, None]
+        b_planes = np.concatenate((b_normals, -np.einsum("ij,ij->i", b_normals, vertices[b_edges[:, 0]])[:, None]), axis = 1)
+        b_quadrics = boundary_weight * b_planes[:, :, None] * b_planes[:, None, :]
+
+        np.add.at(quadrics, b_edges[:, 0], b_quadrics)
+        np.add.at(quadrics, b_edges[:, 1], b_quadrics)
+
+    return quadrics
+
+def _collapse_costs(quadrics, positions, v1, v2):
+    """
+    Vectorized cost and optimal position for collapsing each edge (v1[i], v2[i]).
+    The quadric minimizer competes with the endpoints and midpoint, and is only
+    considered where the quadric is well conditioned and the minimizer stays near the edge.
+    """
+    q = quadrics[v1] + quadrics[v2]
+
+    start = positions[v1]
+    end = positions[v2]
+    midpoints = (start + end)/2
+    optimal = midpoints.copy()
+
+    a = q[:, :3, :3]
+    b = -q[:, :3, 3]
+    solvable = np.abs(np.linalg.det(a)) > 1e-10
+
+    if np.any(solvable):
+        optimal[solvable] = np.linalg.solve(a[solvable], b[solvable][:, :, None])[:, :, 0]
+
+    lengths = np.linalg.norm(end - start, axis = 1)
+    optimal = np.where((np.linalg.norm(optimal - midpoints, axis = 1) <= lengths)[:, None], optimal, midpoints)
+
+    candidates = np.stack((optimal, start, end, midpoints), axis = 1)
+    homogeneous = np.concatenate((candidates, np.ones(candidates.shape[:2] + (1,))), axis = 2)
+    candidate_costs = np.einsum("icj,ijk,ick->ic", homogeneous, q, homogeneous)
+
+    best = np.argmin(candidate_costs, axis = 1)
+    rows = np.arange(len(best))
+
+    return np.maximum(candidate_costs[rows, best], 0), candidates[rows, best]
+
+def simplify(vertices, triangles, target_triangles, boundary_weight = 1e3, batch_size = BATCH_SIZE, faces_per_collapse = FACES_PER_COLLAPSE):
+    """
+    Simplifies a triangle mesh by quadric error metric edge collapse until at most target_triangles remain,
+    or no further collapse is possible without flipping a face.
+
+    Collapses are taken from the heap in rounds of up to batch_size candidates with disjoint neighbourhoods,
+    so that their flip checks, quadric updates and new costs are evaluated in one vectorized call per round.
+    The topology bookkeeping is still Python set and heap work per collapse, so a 56k triangle mesh takes
+    around 4s and meshes with millions of triangles take minutes. Simplify those offline, and only once
+    per primitive type, see LODCache.
+
+    vertices : np.ndarray
+        (V, 3) array of vertex positions.
+
+    triangles : np.ndarray
+        (F, 3) array of vertex indices.
+
+    target_triangles : int
+        Triangle budget of the simplified mesh.
+
+    batch_size : int = BATCH_SIZE
+        Maximum number of collapses per round. A batch_size of 1 is a strictly greedy simplification.
+
+    faces_per_collapse : int = FACES_PER_COLLAPSE
+        Rounds are further limited to one collapse per faces_per_collapse remaining faces.
+
+    Returns a (vertices, triangles, vertex_map) tuple of compacted arrays, where vertex_map[i] is the
+    input vertex that output vertex i was kept from, for carrying per vertex attributes such as colors.
+    """
+    if not isinstance(target_triangles, int) or target_triangles < 0:
+        raise ValueError("target_triangles must be a non-negative int")
+
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("batch_size must be a positive int")
+
+    if not isinstance(faces_per_collapse, int) or faces_per_collapse < 1:
+        raise ValueError("faces_per_collapse must be a positive int")
+
+    positions = np.array(vertices, dtype = float).reshape(-1, 3)
+    faces = np.array(triangles, dtype = np.int64).reshape(-1, 3)
+
+    if len(faces) <= target_triangles:
+        return positions, faces, np.arange(len(positions))
+
+    quadrics = compute_quadrics(positions, faces, boundary_weight = boundary_weight)
+
+    face_list = faces.tolist()
+    face_alive = np.ones(len(faces), dtype = bool)
+    face_count = len(faces)
+    vertex_faces = [set() for _ in range(len(positions))]
+    for face_ind, face in enumerate(face_list):
+        for vertex in face:
+            vertex_faces[vertex].add(face_ind)
+
+    versions = [0] * len(positions)
+
+    edges = np.unique(np.sort(np.concatenate((faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]])), axis = 1), axis = 0)
+    costs, targets = _collapse_costs(quadrics, positions, edges[:, 0], edges[:, 1])
+
+    heap = [(cost, v1, v2, 0, 0, target) for cost, (v1, v2), target in zip(costs.tolist(), edges.tolist(), targets.tolist())]
+    heapq.heapify(heap)
+
+    while heap and face_count > target_triangles:
+        #Gather the cheapest collapses whose neighbourhoods do not touch, so they can be applied in any order
+        batch = []
+        deferred = []
+        locked = set()
+        removable = face_count - target_triangles
+        #Rounds shrink as the mesh gets coarse, where each collapse matters more and order should stay greedy
+        round_size = min(batch_size, max(1, face_count//faces_per_collapse))
+
+        while heap and removable > 0 and len(batch) < round_size:
+            entry = heapq.heappop(heap)
+            _, keep, remove, keep_version, remove_version, target = entry
+
+            #Stale candidate, one of its endpoints has moved or been removed since it was pushed
+            if versions[keep] != keep_version or versions[remove] != remove_version:
+                continue
+
+            ring_faces = vertex_faces[keep] | vertex_faces[remove]
+            ring = {keep, remove}
+            for face_ind in ring_faces:
+                ring.update(face_list[face_ind])
+
+            if not ring.isdisjoint(locked):
+                deferred.append(entry)
+                continue
+
+            locked |= ring
+            shared = vertex_faces[keep] & vertex_faces[remove]
+            batch.append((keep, remove, target, shared, list(ring_faces - shared)))
+            removable -= len(shared)
+
+        for entry in deferred:
+            heapq.heappush(heap, entry)
+
+        if not batch:
+            break
+
+        keeps = np.array([item[0] for item in batch])
+        removes = np.array([item[1] for item in batch])
+        targets = np.array([item[2] for item in batch])
+
+        #Reject collapses that would flip the orientation of a surviving face
+        moved = [face_ind for item in batch for face_ind in item[4]]
+        rejected = np.zeros(len(batch), dtype = bool)
+
+        if moved:
+            owners = np.repeat(np.arange(len(batch)), [len(item[4]) for item in batch])
+            moved_faces = np.array([face_list[face_ind] for face_ind in moved])
+            collapsing = (moved_faces == keeps[owners, None]) | (moved_faces == removes[owners, None])
+
+            old_tris = positions[moved_faces]
+            new_tris = np.where(collapsing[:, :, None], targets[owners, None], old_tris)
+
+            old_normals = np.cross(old_tris[:, 1] - old_tris[:, 0], old_tris[:, 2] - old_tris[:, 0])
+            new_normals = np.cross(new_tris[:, 1] - new_tris[:, 0], new_tris[:, 2] - new_tris[:, 0])
+
+            flipped = (np.einsum("ij,ij->i", old_normals, new_normals) <= 0) & (np.linalg.norm(old_normals, axis = 1) > 0)
+            np.logical_or.at(rejected, owners, flipped)
+
+        accepted = ~rejected
+        positions[keeps[accepted]] = targets[accepted]
+        quadrics[keeps[accepted]] += quadrics[removes[accepted]]
+
+        new_keeps = []
+        new_neighbours = []
+
+        for (keep, remove, _, shared, _), is_rejected in zip(batch, rejected.tolist()):
+            if is_rejected:
+                continue
+
+            for face_ind in shared:
+                face_alive[face_ind] = False
+                face_count -= 1
+                for vertex in face_list[face_ind]:
+                    vertex_faces[vertex].discard(face_ind)
+
+            for face_ind in vertex_faces[remove]:
+                face_list[face_ind] = [keep if vertex == remove else vertex for vertex in face_list[face_ind]]
+                vertex_faces[keep].add(face_ind)
+
+            vertex_faces[remove] = set()
+            versions[keep] += 1
+            versions[remove] += 1
+
+            neighbours = set()
+            for face_ind in vertex_faces[keep]:
+                neighbours.update(face_list[face_ind])
+            neighbours.discard(keep)
+
+            new_keeps.extend([keep] * len(neighbours))
+            new_neighbours.extend(neighbours)
+
+        if not new_keeps:
+            continue
+
+        new_costs, new_targets = _collapse_costs(quadrics, positions, np.array(new_keeps), np.array(new_neighbours))
+
+        for cost, keep, neighbour, new_target in zip(new_costs.tolist(), new_keeps, new_neighbours, new_targets.tolist()):
+            heapq.heappush(heap, (cost, keep, neighbour, versions[keep], versions[neighbour], new_target))
+
+    faces = np.array(face_list, dtype = np.int64).reshape(-1, 3)[face_alive]
+    used, remap = np.unique(faces, return_inverse = True)
+
+    return positions[used], remap.reshape(-1, 3), used
+
+def build_lod_chain(vertices, triangles, budgets, boundary_weight = 1e3):
+    """
+    Builds a chain of progressively coarser meshes, one per triangle budget.
+    Each level is simplified from the previous one rather than from the full resolution mesh.
+
+    budgets : list[int] | tuple[int]
+        Triangle budgets of each level, in any order.
+
+    Returns a list of (vertices, triangles, vertex_map) tuples, starting with the full resolution mesh.
+    Each vertex_map indexes the full resolution vertices, see simplify.
+    """
+    if not isinstance(budgets, (list, tuple)):
+        raise ValueError("budgets must be a list or tuple of ints")
+
+    vertices = np.asarray(vertices, dtype = float).reshape(-1, 3)
+    chain = [(vertices, np.asarray(triangles, dtype = np.int64).reshape(-1, 3), np.arange(len(vertices)))]
+
+    for budget in sorted(budgets, reverse = True):
+        prev_vertices, prev_triangles, prev_map = chain[-1]
+
+        if budget >= len(prev_triangles):
+            continue
+
+        new_vertices, new_triangles, vertex_map = simplify(prev_vertices, prev_triangles, budget, boundary_weight = boundary_weight)
+        chain.append((new_vertices, new_triangles, prev_map[vertex_map]))
+
+    return chain
+
+def to_world(primitive, vertices):
+    """
+    Transforms local, pre-transform space vertices into world space by the scale, orientation and position of primitive.
+
+    primitive : PrimitiveGeomObject
+        Instance whose transform is applied.
+
+    vertices : np.ndarray
+        (V, 3) array of local space vertex positions.
+
+    Returns a (V, 3) array of world space vertex positions.
+    """
+    if not isinstance(primitive, PrimitiveGeomObject):
+        raise ValueError(f"Expected a PrimitiveGeomObject, not an object of type {type(primitive)}")
+
+    pos = primitive.get_pos()
+    rotor = primitive.get_orientation()
+
+    points = np.asarray(vertices, dtype = float).reshape(-1, 3) * np.array([primitive.scale.x, primitive.scale.y, primitive.scale.z])
+    points = rotate_points(points, np.array([rotor.x, rotor.y, rotor.z, rotor.s]))
+
+    return points + np.array([pos.x, pos.y, pos.z])
+
+class LODCache:
+    def __init__(self, budgets, boundary_weight = 1e3):
+        """
+        Caches LOD chains per primitive type, so that instanced objects are only simplified once.
+        Chains are stored in local, pre-transform space, see to_world for placing a level on an instance.
+
+        budgets : list[int] | tuple[int]
+            Triangle budgets of each LOD level.
+
+        boundary_weight : int | float = 1e3
+            Weight of the border preserving constraint planes, see compute_quadrics.
+        """
+        if not isinstance(budgets, (list, tuple)):
+            raise ValueError("budgets must be a list or tuple of ints")
+
+        self.budgets = tuple(budgets)
+        self.boundary_weight = boundary_weight
+        self.chains = {}
+
+    @staticmethod
+    def key_for(primitive):
+        """
+        Primitive instances share a key with every instance of the same type, PrimitivePrisms also need an equal polygon.
+        Any other key is used as given.
+        """
+        if isinstance(primitive, PrimitivePrism):
+            return (PrimitivePrism, tuple((point.x, point.y) for point in primitive.polygon.points))
+
+        if isinstance(primitive, PrimitiveGeomObject):
+            return type(primitive)
+
+        return primitive
+
+    def get_chain(self, primitive, vertices, triangles):
+        """
+        primitive : PrimitiveGeomObject | object
+            Primitive the mesh was built from, or any other hashable cache key.
+
+        vertices : np.ndarray
+            (V, 3) array of vertex positions in local, pre-transform space.
+
+        triangles : np.ndarray
+            (F, 3) array of vertex indices.
+        """
+        key = LODCache.key_for(primitive)
+
+        if key not in self.chains:
+            self.chains[key] = build_lod_chain(vertices, triangles, self.budgets, boundary_weight = self.boundary_weight)
+
+        return self.chains[key]
+
+    def has_chain(self, primitive):
+        return LODCache.key_for(primitive) in self.chains
+
+    def get_level(self, primitive, vertices, triangles, max_triangles):
+        """
+        Returns the finest cached level with at most max_triangles triangles, or the coarsest level if none fit.
+        Levels are in local space, the same space vertices were given in.
+        """
+        chain = self.get_chain(primitive, vertices, triangles)
+
+        for level in chain:
+            if len(level[1]) <= max_triangles:
+                return level
+
+        return chain[-1]
+
+    def clear(self):
+        self.chains = {}
@@ -97,28 +97,102 @@ class Polygon:
             
             point = Vector2(*point)
 
+        #Half open crossing rule, an edge counts if it spans the ray's y on one side only, so vertices are never counted twice
+        #Points on the boundary may be reported as either inside or outside
         cross_counter = 0
         for i in range(len(self.points)):
             start = self.points[i-1]
-            end = self.points[i] 
+            end = self.points[i]
 
-            if point.x < start.x and point.x < end.x:
-                if point.y < start.y and point.y > end.y or point.y > start.y and point.y < end.y:
-                    cross_counter += 1
-            
-            elif (point.x < start.x and point.x > end.x) or (point.x > start.x and point.x < end.x):
+            if (start.y > point.y) != (end.y > point.y):
+                cross_x = start.x + (point.y - start.y) * (end.x - start.x)/(end.y - start.y)
 
-                t = Vector2.rev_lerp(start.x, end.x, point.x)
-                close_point = Vector2.lerp(start, end, t)
-
-                if start.x < point.x and ((point.y > end.y and point.y < close_point.y) or (point.y < end.y and point.y > close_point.y)):
-                    cross_counter += 1
-                    
-                elif start.x > point.x and ((point.y > start.y and point.y < close_point.y) or (point.y < start.y and point.y > close_point.y)):
+                if point.x < cross_x:
                     cross_counter += 1
 
         return bool(cross_counter % 2)
     
+    def overlaps(self, other):
+        """
+        Whether the interiors of self and other overlap.
+        Polygons that only share edges or vertices, such as abutting platforms, do not overlap.
+        """
+        if not isinstance(other, Polygon):
+            raise ValueError(f"Overlap is only defined between Polygons, not {type(self)} and {type(other)}")
+
+        for i in range(len(self.points)):
+            for j in range(len(other.points)):
+                if Polygon._segments_cross(self.points[i-1], self.points[i], other.points[j-1], other.points[j]):
+                    return True
+
+        #No edges properly cross, so the interiors overlap only if part of one boundary runs inside the other
+        return self._boundary_enters(other) or other._boundary_enters(self)
+
+    def _boundary_enters(self, other):
+        for i in range(len(self.points)):
+            start = self.points[i-1]
+            end = self.points[i]
+            side = end - start
+
+            #Without proper crossings, other's boundary can only meet this edge at its ends or at other's vertices
+            cuts = [0, 1]
+            for point in other.points:
+                if Polygon._on_segment(point, start, end):
+                    cuts.append(Vector2.dot(point - start, side)/Vector2.dot(side, side))
+
+            cuts.sort()
+
+            for t_1, t_2 in zip(cuts[:-1], cuts[1:]):
+                if t_2 - t_1 < EPS:
+                    continue
+
+                mid = start + side * ((t_1 + t_2)/2)
+                shared_edge = None
+
+                for j in range(len(other.points)):
+                    if Polygon._on_segment(mid, other.points[j-1], other.points[j]):
+                        shared_edge = (other.points[j-1], other.points[j])
+                        break
+
+                if shared_edge is None:
+                    if other.is_inside(mid):
+                        return True
+
+                #Collinear edges, the interiors overlap if they lie on the same side of it
+                elif Vector2.dot(self._inward(start, end), other._inward(*shared_edge)) > 0:
+                    return True
+
+        return False
+
+    def _inward(self, start, end):
+        side = end - start
+
+        if self.ccw:
+            return Vector2(-side.y, side.x)
+        
+        return Vector2(side.y, -side.x)
+
+    @staticmethod
+    def _on_segment(point, start, end):
+        side = end - start
+        offset = point - start
+        length_sq = Vector2.dot(side, side)
+
+        if abs(side.x * offset.y - side.y * offset.x) > EPS * max(length_sq, 1):
+            return False
+        
+        return -EPS <= Vector2.dot(offset, side) <= length_sq + EPS
+
+    @staticmethod
+    def _segments_cross(start_1, end_1, start_2, end_2):
+        d_1 = (end_1.x - start_1.x) * (start_2.y - start_1.y) - (end_1.y - start_1.y) * (start_2.x - start_1.x)
+        d_2 = (end_1.x - start_1.x) * (end_2.y - start_1.y) - (end_1.y - start_1.y) * (end_2.x - start_1.x)
+        d_3 = (end_2.x - start_2.x) * (start_1.y - start_2.y) - (end_2.y - start_2.y) * (start_1.x - start_2.x)
+        d_4 = (end_2.x - start_2.x) * (end_1.y - start_2.y) - (end_2.y - start_2.y) * (end_1.x - start_2.x)
+
+        #Proper crossings only, touching and collinear segments are handled by overlaps
+        return d_1 * d_2 < 0 and d_3 * d_4 < 0
+
     def split_between(self, ind_1, ind_2):
         if not isinstance(ind_1, int) or not isinstance(ind_2, int):
             raise ValueError("Vertex indices must be integers!")
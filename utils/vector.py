@@ -86,7 +86,7 @@ class Quaternion:
             ratio = other.s/self.s
 
         if abs(abs(self.x * ratio) - abs(other.x)) < EPS and abs(abs(self.y * ratio) - abs(other.y)) < EPS and\
-              abs(abs(self.z * ratio) - abs(other.z)) < EPS and abs(abs(self.s * ratio) - abs(other.s)):
+              abs(abs(self.z * ratio) - abs(other.z)) < EPS and abs(abs(self.s * ratio) - abs(other.s)) < EPS:
             return True
         
         return False
@@ -121,6 +121,34 @@ class Quaternion:
         
         return (vect_2 - vect_1) * t + vect_1
     
+    @staticmethod
+    def slerp(rotor_1, rotor_2, t):
+        if not isinstance(rotor_1, Quaternion) or not isinstance(rotor_2, Quaternion) or isinstance(rotor_1, Vector3) or isinstance(rotor_2, Vector3):
+            raise ValueError(f"Spherical linear interpolation not defined for objects of type {type(rotor_1)} and {type(rotor_2)}")
+        
+        if not isinstance(t, (int, float)):
+            raise ValueError(f"t must be numeric, not of type {type(t)}")
+        
+        if rotor_1.norm() < EPS or rotor_2.norm() < EPS:
+            raise ValueError("Rotors cannot have 0 magnitude!")
+        
+        rotor_1 = rotor_1/rotor_1.norm()
+        rotor_2 = rotor_2/rotor_2.norm()
+
+        #q and -q are the same rotation, take the shortest arc
+        cos_ang = Quaternion.dot(rotor_1, rotor_2)
+        if cos_ang < 0:
+            rotor_2 = -rotor_2
+            cos_ang = -cos_ang
+
+        #Nearly parallel rotors, fall back to normalized lerp
+        if cos_ang > 1 - 1e-6:
+            out = rotor_1 * (1 - t) + rotor_2 * t
+            return out/out.norm()
+        
+        ang = math.acos(cos_ang)
+        return (rotor_1 * math.sin((1 - t) * ang) + rotor_2 * math.sin(t * ang))/math.sin(ang)
+    
     @staticmethod
     def rev_lerp(vect_1, vect_2, vect_3):
         if not isinstance(vect_1, (Vector3, int, float)) or not isinstance(vect_2, (Vector3, int, float)) or not isinstance(vect_3, (Vector3, int, float)):
@@ -152,6 +180,53 @@ class Vector3(Quaternion):
         self.x = x
         self.y = y
         self.z = z
+        self.s = 0
+
+    def _like(self, other, x, y, z):
+        #Arithmetic between Vector2s stays in the plane, anything else is a Vector3
+        if isinstance(self, Vector2) and (other is None or isinstance(other, Vector2)):
+            return Vector2(x, y)
+        
+        return Vector3(x, y, z)
+
+    def __add__(self, other):
+        if not isinstance(other, Vector3):
+            return super().__add__(other)
+        
+        return self._like(other, self.x + other.x, self.y + other.y, self.z + other.z)
+    
+    def __sub__(self, other):
+        if not isinstance(other, Vector3):
+            return super().__sub__(other)
+        
+        return self._like(other, self.x - other.x, self.y - other.y, self.z - other.z)
+    
+    def __mul__(self, other):
+        if not isinstance(other, (int, float)):
+            return super().__mul__(other)
+        
+        return self._like(None, self.x * other, self.y * other, self.z * other)
+    
+    def __truediv__(self, other):
+        if not isinstance(other, (int, float)):
+            raise ValueError(f"Division is not defined for {type(self)} and object of type {type(other)}")
+        
+        if abs(other) < EPS:
+            raise ZeroDivisionError()
+        
+        return self._like(None, self.x/other, self.y/other, self.z/other)
+    
+    def __neg__(self):
+        return self._like(None, -self.x, -self.y, -self.z)
+    
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+    
+    def __str__(self):
+        return f"<{self.x}, {self.y}, {self.z}>"
+    
+    def __repr__(self):
+        return f"<{self.x}, {self.y}, {self.z}>"
 
     @staticmethod
     def angle_between(vect_1, vect_2):
@@ -170,7 +245,7 @@ class Vector3(Quaternion):
         if not isinstance(vect_1, Vector3) or not isinstance(vect_2, Vector3):
             raise ValueError(f"Cross product is not defined for objects of type {type(vect_1)} and {type(vect_2)}")
         
-        return Vector3(vect_1.y * vect_2.z - vect_1.z * vect_2.y, vect_1.z * vect_2.x - vect_1.z * vect_2.z, vect_1.x * vect_2.y - vect_1.y * vect_2.x)
+        return Vector3(vect_1.y * vect_2.z - vect_1.z * vect_2.y, vect_1.z * vect_2.x - vect_1.x * vect_2.z, vect_1.x * vect_2.y - vect_1.y * vect_2.x)
     
     @staticmethod
     def ccw_angle_between(vect_1, vect_2, plane_normal):
@@ -202,6 +277,15 @@ class Vector2(Vector3):
     def __init__(self, x, y):
         super().__init__(x, y, 0)
 
+    def __iter__(self):
+        return iter((self.x, self.y))
+    
+    def __str__(self):
+        return f"<{self.x}, {self.y}>"
+    
+    def __repr__(self):
+        return f"<{self.x}, {self.y}>"
+
     @staticmethod
     def signed_cross_mag(vect_1, vect_2):
         if not isinstance(vect_1, Vector3) or not isinstance(vect_2, Vector3):